@@ -10,6 +10,8 @@ class InputStrategy(ABC):
     """Represents the method to get a user input per prompt
     in interactive mode."""
 
+    __slots__ = ()
+
     @abstractmethod
     def input(self) -> str:
         """Get a user input."""
@@ -29,7 +31,7 @@ class IExecuteSingle(ABC):
     that represents the action for single input."""
 
     @abstractmethod
-    def _execute_single(self, source: str) -> str:
+    def _execute_single_inner(self, source: str) -> str:
         """Process the input prompt, and returns the text to show it later."""
 
 
@@ -38,7 +40,7 @@ class IExecuteMultiple(ABC):
     represents the action for dual input."""
 
     @abstractmethod
-    def _execute_multi(self, first: str, second: str) -> str:
+    def _execute_multi_inner(self, first: str, second: str) -> str:
         """Process the two prompts and return the text to show it later."""
 
 
@@ -92,6 +94,8 @@ class SubParserAppendable(ABC):
 class ConsoleWritable(ABC):
     """Traits that writes and errors."""
 
+    __slots__ = ()
+
     @abstractmethod
     def _write(self, text: str) -> None:
         """Writes the message to the standard output."""
@@ -1,7 +1,5 @@
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from enum import Enum, auto
 
 from sanipro.logger import logger
 
@@ -75,20 +73,13 @@ class ExecuteSingle(ConsoleWriter, IExecuteSingle, ABC):
 
     _input_strategy: InputStrategy
 
-    @abstractmethod
-    def _execute_single_inner(self, source: str) -> str:
-        """Implements specific features that rely on inherited class."""
-
-    def _execute_single(self, source: str) -> str:
-        return self._execute_single_inner(source)
-
     def _start_loop(self) -> None:
         while True:
             try:
                 try:
                     prompt_input = self._input_strategy.input()
                     if prompt_input:
-                        out = self._execute_single(prompt_input)
+                        out = self._execute_single_inner(prompt_input)
                         if out:
                             self._write(f"{out}\n")
                 except EOFError:
@@ -97,20 +88,6 @@ class ExecuteSingle(ConsoleWriter, IExecuteSingle, ABC):
                 logger.exception(f"error: {e}")
 
 
-class _InputState(Enum):
-    FIRST_INPUT = auto()
-    SECOND_INPUT = auto()
-    EXECUTE = auto()
-
-
-@dataclass
-class _InputContext:
-    first: str = ""
-    second: str = ""
-    original_color: str = ""
-    state: _InputState = _InputState.FIRST_INPUT
-
-
 class ExecuteMultiple(ConsoleWriter, IExecuteMultiple, ABC):
     """Represents the runner with the interactive user interface
     that expects two different prompts."""
@@ -120,13 +97,6 @@ class ExecuteMultiple(ConsoleWriter, IExecuteMultiple, ABC):
     _input_strategy: InputStrategy
     _calculator: SetCalculator
 
-    @abstractmethod
-    def _execute_multi_inner(self, first: str, second: str) -> str:
-        """Implements specific features that rely on inherited class."""
-
-    def _execute_multi(self, first: str, second: str) -> str:
-        return self._execute_multi_inner(first, second)
-
     def _handle_input(self) -> str:
         while True:
             try:
@@ -138,89 +108,49 @@ class ExecuteMultiple(ConsoleWriter, IExecuteMultiple, ABC):
             except Exception as e:
                 logger.exception(f"error: {e}")
 
-    def _handle_first_input(self) -> _InputState:
-        try:
-            self._ctx.first = self._handle_input()
-            if self._ctx.first:
-                return _InputState.SECOND_INPUT
-        except EOFError:
-            raise
-        return _InputState.FIRST_INPUT
-
-    def _do_handle_second_input(self) -> None:
-        pass
-
-    def _handle_second_input(self) -> _InputState:
-        self._do_handle_second_input()
-        try:
-            self._ctx.second = self._handle_input()
-            if self._ctx.second:
-                return _InputState.EXECUTE
-        except EOFError:
-            self._on_eof()
-            return _InputState.FIRST_INPUT
-        return _InputState.SECOND_INPUT
-
-    def _on_eof(self) -> None:
-        pass
-
-    def _handle_execution(self) -> None:
-        out = self._execute_multi(self._ctx.first, self._ctx.second)
-        if out:
-            self._write(f"{out}\n")
-        self._do_handle_execution()
-
-    def _do_handle_execution(self) -> None:
-        pass
-
-    def _process_state(self) -> bool:
-
-        handlers = {
-            _InputState.FIRST_INPUT: self._handle_first_input,
-            _InputState.SECOND_INPUT: self._handle_second_input,
-        }
-
-        if self._ctx.state in handlers:
-            self._ctx.state = handlers[self._ctx.state]()
-            return True
-        elif self._ctx.state == _InputState.EXECUTE:
-            self._handle_execution()
-            return False
-        return True
+    def _before_second_input(self) -> None:
+        """The method to be called before waiting for the second prompt."""
+
+    def _after_second_input(self) -> None:
+        """The method to be called after the second prompt is given,
+        or cancelled by EOF."""
 
     def _start_loop(self) -> None:
         while True:
             try:
-                self._ctx = _InputContext()
-                while self._process_state():
-                    continue
+                first = self._handle_input()
             except EOFError:
                 break
 
+            self._before_second_input()
+            try:
+                second = self._handle_input()
+            except EOFError:
+                # going back to the first prompt
+                continue
+            finally:
+                self._after_second_input()
+
+            out = self._execute_multi_inner(first, second)
+            if out:
+                self._write(f"{out}\n")
+
 
 class ExecuteMultipleNocolor(ExecuteMultiple):
     pass
 
 
 class ExecuteMultipleColor(ExecuteMultiple):
-    def _do_handle_second_input(self) -> None:
+    def _before_second_input(self) -> None:
         self.color.color_foreground = "green"
 
-    def _on_eof(self) -> None:
-        self.color.color_foreground = self._ctx.original_color
-
-    def _do_handle_execution(self) -> None:
-        self.color.color_foreground = self._ctx.original_color
+    def _after_second_input(self) -> None:
+        self.color.color_foreground = self._original_color
 
     def _start_loop(self) -> None:
         from saniprocli import color
 
         self.color = color
+        self._original_color = color.color_foreground
 
-        while True:
-            try:
-                self._ctx = _InputContext(original_color=color.color_foreground)
-                while self._process_state():
-                    continue
-            except EOFError:
-                break
+        super()._start_loop()
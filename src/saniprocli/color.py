@@ -19,14 +19,21 @@ class EscSeqWrapper:
         return EscSeqWrapper.pattern.sub(r"\01\g<1>\02", text)
 
 
-def style_for_readline(text: str) -> str:
-    """Styles a text with ANSI style and readline compatibility,
-    and returns the new string."""
-
-    style_partial = functools.partial(click.style, fg=color_foreground)
-    text_styled = style_partial(text)
+@functools.lru_cache(maxsize=128)
+def _style_for_readline(text: str, fg: str) -> str:
+    text_styled = click.style(text, fg=fg)
 
     if text == text_styled:
         return text
 
     return EscSeqWrapper.wrap(text_styled)
+
+
+def style_for_readline(text: str) -> str:
+    """Styles a text with ANSI style and readline compatibility,
+    and returns the new string.
+
+    The result is cached per the pair of the text and the current
+    foreground color, since prompts rarely change in a session."""
+
+    return _style_for_readline(text, color_foreground)
@@ -4,6 +4,8 @@ from saniprocli.abc import ConsoleWritable
 
 
 class ConsoleWriter(ConsoleWritable):
+    __slots__ = ()
+
     def _write(self, text: str) -> None:
         """Writes the text to the standard output."""
         sys.stdout.write(text)
@@ -18,23 +18,28 @@ def input_last_break(prompt: str = "") -> str:
     return txt
 
 
+def read_until_eof() -> str:
+    """Reads the whole standard input at once, instead of consuming
+    it line by line.
+
+    Raises EOFError if there is nothing left to read."""
+    txt = sys.stdin.read()
+    if txt == "":
+        raise EOFError
+    return txt
+
+
 class DirectInputStrategy(InputStrategy):
-    """Calles sys.stdin.readline() to get a user input."""
+    """Reads sys.stdin until EOF to get a user input."""
+
+    __slots__ = ()
 
     def input(self) -> str:
         """Preserves line breaks."""
-        bufs: list[str] = []
-        while True:
-            try:
-                chunk = sys.stdin.readline()
-                if chunk == "":  # EOF
-                    if bufs:  # If there is any buffered input, return it
-                        return "".join(bufs)
-                    else:
-                        raise EOFError
-                bufs.append(chunk)
-            except KeyboardInterrupt:
-                exit(1)
+        try:
+            return read_until_eof()
+        except KeyboardInterrupt:
+            exit(1)
 
 
 def _no_style(text: str) -> str:
@@ -58,6 +63,8 @@ class OnelineInputStrategy(InputStrategy, ConsoleWriter):
     in interactive mode.
     It consumes just one line to get the input by a user."""
 
+    __slots__ = ("ps1", "try_stylize")
+
     def __init__(self, ps1: str = "", use_color: bool = False) -> None:
         super().__init__()
         self.ps1 = ps1
@@ -83,6 +90,8 @@ class MultipleInputStrategy(InputStrategy, ConsoleWriter):
     It consumes multiple lines and reduce them to a string,
     and users must confirm their input by sending EOF (^D)."""
 
+    __slots__ = ("ps1", "ps2", "try_stylize")
+
     def __init__(self, ps1: str = "", ps2: str = "", use_color: bool = False) -> None:
         super().__init__()
         self.ps1 = ps1
@@ -98,6 +107,14 @@ class MultipleInputStrategy(InputStrategy, ConsoleWriter):
         return f"{type(self).__name__}(ps1={self.ps1}, ps2={self.ps2})"
 
     def input(self) -> str:
+        if not sys.stdin.isatty():
+            # nobody is there to confirm each prompt, so let's
+            # take all the lines piped in with a single read
+            try:
+                return read_until_eof()
+            except KeyboardInterrupt:
+                exit(1)
+
         buffer = []
         _current_prompt = self.ps1
         _initial_prompt = _current_prompt
@@ -114,7 +131,7 @@ class MultipleInputStrategy(InputStrategy, ConsoleWriter):
                 _current_prompt = _initial_prompt
             except EOFError:
                 if buffer:
-                    sys.stdout.write("\n")
+                    self._write("\n")
                     break
                 else:
                     raise
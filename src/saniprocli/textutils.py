@@ -5,6 +5,11 @@ from sanipro.logger import logger
 
 
 class CSVUtilsBase(ABC):
+    __slots__ = ("lines", "delim")
+
+    # the dictionary type that prepare_kv() builds the result into
+    mapping_type: type[dict[str, str]] = dict
+
     def __init__(self, lines: list[str], delim: str) -> None:
         self.lines = lines
         self.delim = delim
@@ -30,7 +35,7 @@ class CSVUtilsBase(ABC):
     def _do_preprocess(self, column: list[str]) -> list[str]:
         raise NotImplementedError
 
-    def prepare_kv(self, key_idx: int, value_idx: int):
+    def prepare_kv(self, key_idx: int, value_idx: int) -> dict[str, str]:
         self.is_ranged_or_raise(key_idx, value_idx)
         self.is_different_idx_or_raise(key_idx, value_idx)
         lines = self.lines
@@ -40,7 +45,7 @@ class CSVUtilsBase(ABC):
 
         try:
             it = self.preprocess(lines)
-            return {row[k]: row[v] for row in it}
+            return self.mapping_type((row[k], row[v]) for row in it)
         except IndexError as e:
             raise type(e)("failed to get the element of the row number")
 
@@ -68,11 +73,13 @@ def get_temp_filename(tmp_dir: str) -> str:
 
 
 def dump_to_file(path: str, lines: Iterable[str]) -> None:
-    """Dump lines to file."""
+    """Dump lines to file.
+
+    Lines are streamed through a large write buffer rather than
+    joined into a single string in memory first."""
 
-    with open(path, mode="w") as fp:
-        fp.write("\n".join(lines))
-        fp.write("\n")
+    with open(path, mode="w", buffering=1024 * 1024) as fp:
+        fp.writelines(f"{line}\n" for line in lines)
 
 
 class ClipboardHandler:
@@ -3,8 +3,8 @@ import atexit
 import collections
 import collections.abc
 import os
-import re
-import readline
+import pickle
+import stat
 import sys
 import typing
 
@@ -18,7 +18,7 @@ from saniprocli.abc import CliRunnable, InputStrategy
 from saniprocli.cli_runner import ExecuteSingle, RunnerDeclarative, RunnerInteractive
 from saniprocli.commands import CliArgsNamespaceDefault, CliCommands
 from saniprocli.sanipro_argparse import SaniproArgumentParser
-from saniprocli.textutils import CSVUtilsBase, dump_to_file, get_temp_filename
+from saniprocli.textutils import CSVUtilsBase
 
 
 class CliArgsNamespaceDemo(CliArgsNamespaceDefault):
@@ -88,7 +88,12 @@ class CliArgsNamespaceDemo(CliArgsNamespaceDefault):
         parser.add_argument(
             "infile",
             type=argparse.FileType("r"),
-            help="Specifies the text file comprised from two columns, each separated with delimiter.",
+            help=(
+                "Specifies the text file comprised from two columns, "
+                "each separated with delimiter. The parsed result is cached "
+                "as a pickle file beside it, which is only loaded when it is "
+                "owned by you and not writable by others."
+            ),
         )
 
         parser.add_argument(
@@ -119,10 +124,10 @@ class CliArgsNamespaceDemo(CliArgsNamespaceDefault):
             "--tempdir",
             default="/dev/shm",
             help=(
-                "Use this directory as a tempfile storage. Technically speaking, "
-                "the program creates a new text file by extracting the field "
-                "from a csv file, format and save them so the GNU Readline "
-                "can read the histfile on this directory."
+                "Deprecated and has no effect. The keys extracted from "
+                "the csv file used to be saved as a histfile in this directory "
+                "for the GNU Readline, but now they are added to the history "
+                "directly."
             ),
         )
 
@@ -138,7 +143,105 @@ class CliArgsNamespaceDemo(CliArgsNamespaceDefault):
         pass
 
 
+class TagCount(dict[str, str]):
+    """The key-value storage of tags, which gives "NULL"
+    instead of raising KeyError for unknown tags."""
+
+    __slots__ = ()
+
+    def __missing__(self, key: str) -> str:
+        return "NULL"
+
+
+# bump this whenever the parsing result of CsvUtils changes
+CACHE_VERSION = 1
+
+
+def _is_trusted_file(st: os.stat_result) -> bool:
+    """Whether the file is owned by the current user,
+    and nobody else can write to it."""
+
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return False
+    return not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
 class CsvUtils(CSVUtilsBase):
+    __slots__ = ()
+
+    mapping_type = TagCount
+
+    @classmethod
+    def create_dict_from_io_cached(
+        cls, text: typing.TextIO, delim: str, key_idx: int, value_idx: int
+    ) -> TagCount:
+        """Same as `create_dict_from_io()`, but the dictionary is pickled
+        beside the csv file, so that the following runs can skip parsing
+        as long as the size and the mtime of the csv file, and `CACHE_VERSION`
+        stay the same.
+
+        Since unpickling can run arbitrary code, the cache is only loaded
+        when it is owned by the current user and not writable by others."""
+
+        try:
+            # the file being parsed, even if the path was replaced since
+            csv_stat = os.fstat(text.fileno())
+        except (AttributeError, OSError):
+            csv_stat = None
+
+        csv_path = getattr(text, "name", None)
+        if (
+            csv_stat is None
+            or not stat.S_ISREG(csv_stat.st_mode)
+            or not isinstance(csv_path, str)
+        ):
+            # e.g. <stdin>
+            return cls.create_dict_from_io(text, delim, key_idx, value_idx)
+
+        cache_path = f"{csv_path}.{delim.encode().hex()}.{key_idx}.{value_idx}.pkl"
+        csv_key = (CACHE_VERSION, csv_stat.st_size, csv_stat.st_mtime_ns)
+
+        try:
+            with open(cache_path, "rb") as fp:
+                if _is_trusted_file(os.fstat(fp.fileno())):
+                    cached_key, tags = pickle.load(fp)
+                    if cached_key == csv_key and isinstance(tags, TagCount):
+                        return tags
+                else:
+                    logger.warning("%s: ignoring the untrusted cache", cache_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:  # like a truncated cache
+            logger.debug("%s: failed to load the cache: %s", cache_path, e)
+
+        tag_count = cls.create_dict_from_io(text, delim, key_idx, value_idx)
+        cls._save_cache(cache_path, csv_key, tag_count)
+        return tag_count
+
+    @staticmethod
+    def _save_cache(
+        cache_path: str, csv_key: tuple[int, int, int], tags: TagCount
+    ) -> None:
+        import tempfile
+
+        try:
+            # created with 0600 by mkstemp, then moved into place
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".")
+        except OSError as e:
+            logger.debug("%s: failed to save the cache: %s", cache_path, e)
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                pickle.dump((csv_key, tags), fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.debug("%s: failed to save the cache: %s", cache_path, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
     def _do_preprocess(self, column: list[str]):
         column[0] = self.replace_underscore(column[0])
         return column
@@ -150,8 +253,6 @@ class CsvUtils(CSVUtilsBase):
 
 
 class TFindEscaper:
-    parentheses = re.compile(r"([\(\)])")
-
     @staticmethod
     def escape_parentheses(text: str):
         """Escapes a backslash which possibly allows another backslash
@@ -159,7 +260,7 @@ class TFindEscaper:
 
         e.g. `( ) ===> \\( \\)`"""
 
-        return re.sub(TFindEscaper.parentheses, r"\\\g<1>", text)
+        return text.replace("(", r"\(").replace(")", r"\)")
 
 
 class Formatter:
@@ -184,18 +285,27 @@ class WeightedFormatter:
 
     @staticmethod
     def to_csv(delimiter: str) -> collections.abc.Callable:
+        # the weight is always the same, so format it only once
+        suffix = "%s%f" % (delimiter, 1.0)
+
         def f(token: str) -> str:
-            return "%s%s%f" % (token, delimiter, 1.0)
+            return token + suffix
 
         return f
 
 
 class TokenFinder:
-    def __init__(self, delimiter: Delimiter, formatter: collections.abc.Callable):
+    __slots__ = ("_delimiter", "_formatter")
+
+    def __init__(
+        self, delimiter: Delimiter, formatter: collections.abc.Callable | None
+    ) -> None:
+        """`formatter` can be None, meaning the tokens are output as is."""
+
         self._delimiter = delimiter
         self._formatter = formatter
 
-    def execute(self, prompt: str, kvstore: dict[str, str]) -> str:
+    def execute(self, prompt: str, kvstore: TagCount) -> str:
         in_d = self._delimiter.sep_input
         out_d = self._delimiter.sep_output
         field_d = self._delimiter.sep_field
@@ -203,40 +313,34 @@ class TokenFinder:
         if field_d is None:
             raise ValueError("field delimiter is None")
 
-        result = []
-
-        for token in prompt.split(in_d):
-            new_token = token.strip()
-            if not new_token:
-                break
+        fmt = self._formatter
 
-            nums = kvstore.get(new_token, "NULL")
-            token_escaped = self._formatter(new_token)
-            columns = [token_escaped, nums]
-
-            serialized = field_d.join(columns)
-            result.append(serialized)
-
-        return out_d.join(result)
+        tokens = (token.strip() for token in prompt.split(in_d))
+        if fmt is None:
+            return out_d.join(
+                f"{token}{field_d}{kvstore[token]}" for token in tokens if token
+            )
+        return out_d.join(
+            f"{fmt(token)}{field_d}{kvstore[token]}" for token in tokens if token
+        )
 
 
 class RunnerTagFindInteractive(ExecuteSingle, RunnerInteractive):
     """Represents the runner specialized for the filtering mode."""
 
-    _histfile: str
-
     def __init__(
         self,
         finder: TokenFinder,
-        tags_n_count: dict[str, str],
+        tags_n_count: TagCount,
         strategy: InputStrategy,
-        tempdir: str,
         use_clipboard: bool,
     ) -> None:
         self._app = finder
         self._input_strategy = strategy
-        self.tags_n_count: dict[str, str] = tags_n_count
-        self.tempdir = tempdir
+        self.tags_n_count: TagCount = tags_n_count
+        # materialized once, so that the history (or a completer later)
+        # does not have to walk the dictionary again
+        self._tag_keys: list[str] = list(tags_n_count)
         self._use_clipboard = use_clipboard
 
     @classmethod
@@ -248,39 +352,27 @@ class RunnerTagFindInteractive(ExecuteSingle, RunnerInteractive):
         delim: str,
         key_idx: int,
         value_idx: int,
-        tempdir: str,
         use_clipboard: bool,
     ) -> Self:
         """Import the key-value storage from a comma-separated file.
         The index starts from 1. This is because common traditional command-line
-        utilities assume the field index originates from 1.
-
-        The `tempdir` is used to store the history file for the GNU Readline.
-        """
+        utilities assume the field index originates from 1."""
 
         try:
-            tag_n_count = CsvUtils.create_dict_from_io(text, delim, key_idx, value_idx)
-            return cls(finder, tag_n_count, strategy, tempdir, use_clipboard)
+            tag_n_count = CsvUtils.create_dict_from_io_cached(
+                text, delim, key_idx, value_idx
+            )
+            return cls(finder, tag_n_count, strategy, use_clipboard)
         except IndexError as e:
             raise type(e)
 
     def _on_init(self) -> None:
-        histfile = get_temp_filename(self.tempdir)
-        dump_to_file(histfile, self.tags_n_count.keys())
-
-        try:
-            readline.read_history_file(histfile)
-        except FileNotFoundError as e:
-            raise type(e)("failed to read history file: %s" % (histfile,))
-
-        # so that the file is deleted after the program exits
-        self._histfile = histfile
+        import readline
 
-    def _on_exit(self) -> None:
-        try:
-            os.remove(self._histfile)
-        except OSError:
-            logger.warning("%s: history file was not deleted", self._histfile)
+        # readline keeps the history in memory, so there is no need
+        # to write the keys out to a file just to read them back
+        for key in self._tag_keys:
+            readline.add_history(key)
 
     def _execute_single_inner(self, source: str) -> str:
         return self._app.execute(source, self.tags_n_count)
@@ -290,12 +382,11 @@ class RunnerTagFindNonInteractive(ExecuteSingle, RunnerDeclarative):
     """Represents the runner specialized for the filtering mode."""
 
     def __init__(
-        self, finder: TokenFinder, tags_n_count: dict[str, str], strategy: InputStrategy
+        self, finder: TokenFinder, tags_n_count: TagCount, strategy: InputStrategy
     ) -> None:
         self._app = finder
         self._input_strategy = strategy
-        self.tags_n_count: dict[str, str] = tags_n_count
-        self._histfile = ""
+        self.tags_n_count: TagCount = tags_n_count
 
     @classmethod
     def create_from_csv(
@@ -311,7 +402,9 @@ class RunnerTagFindNonInteractive(ExecuteSingle, RunnerDeclarative):
         The index starts from 1. This is because common traditional command-line
         utilities assume the field index originates from 1."""
         try:
-            tags_n_count = CsvUtils.create_dict_from_io(text, delim, key_idx, value_idx)
+            tags_n_count = CsvUtils.create_dict_from_io_cached(
+                text, delim, key_idx, value_idx
+            )
             return cls(finder, tags_n_count, strategy)
         except IndexError:
             raise
@@ -322,6 +415,8 @@ class RunnerTagFindNonInteractive(ExecuteSingle, RunnerDeclarative):
 
 def prepare_readline() -> None:
     """Prepare readline for the interactive mode."""
+    import readline
+
     histfile = os.path.join(os.path.expanduser("~"), ".tagfinder_history")
 
     try:
@@ -356,7 +451,9 @@ class CliCommandsDemo(CliCommands):
         )
 
     def to_runner(self) -> CliRunnable:
-        cli_hooks.on_init.append(prepare_readline)
+        if self._args.interactive:
+            # so that readline is not even imported for piped input
+            cli_hooks.on_init.append(prepare_readline)
         cli_hooks.execute(cli_hooks.on_init)
 
         delimiter = Delimiter(
@@ -370,7 +467,8 @@ class CliCommandsDemo(CliCommands):
         fmt_mapping = {
             "a1111compat": Formatter.to_a1111_compat,
             "a1111": Formatter.to_a1111,
-            "csv": Formatter.to_csv,
+            # Formatter.to_csv is the identity, so skip calling it at all
+            "csv": None,
         }
 
         formatter = None
@@ -389,7 +487,6 @@ class CliCommandsDemo(CliCommands):
                 self._args.dict_field_separator,
                 self._args.key_field,
                 self._args.value_field,
-                self._args.tempdir,
                 self._args.clipboard,
             )
         else:
@@ -1,6 +1,7 @@
 import re
 import unittest
 
+from saniprocli import color
 from saniprocli.color import EscSeqWrapper
 
 
@@ -31,3 +32,15 @@ class TestEscSeqWrapper(unittest.TestCase):
         for input_text, expected in test_cases:
             with self.subTest(pattern=input_text):
                 self.assertEqual(EscSeqWrapper.wrap(input_text), expected)
+
+
+class TestStyleForReadline(unittest.TestCase):
+    def test_follows_color_foreground(self):
+        original = color.color_foreground
+        self.addCleanup(setattr, color, "color_foreground", original)
+
+        color.color_foreground = "cyan"
+        self.assertEqual(color.style_for_readline(">>> "), "\1\33[36m\2>>> \1\33[0m\2")
+
+        color.color_foreground = "green"
+        self.assertEqual(color.style_for_readline(">>> "), "\1\33[32m\2>>> \1\33[0m\2")
@@ -1,3 +1,4 @@
+import collections
 import unittest
 
 from saniprocli.textutils import CSVUtilsBase
@@ -29,6 +30,25 @@ class TestCSVUtils(unittest.TestCase):
             csvutil = self.csvutil(input_text, ",")
             self.assertEqual(csvutil.prepare_kv(*rownum), expected)
 
+    def test_prepare_kv_quotes_as_is(self):
+        rowdata = ['"quoted tag,1\n', "x,2\n"]
+        csvutil = self.csvutil(rowdata, ",")
+
+        self.assertEqual(csvutil.prepare_kv(1, 2), {'"quoted tag': "1", "x": "2"})
+
+    def test_prepare_kv_strip(self):
+        rowdata = ["100,long_hair \n", "50,solo\t\n"]
+        csvutil = self.csvutil(rowdata, ",")
+
+        self.assertEqual(csvutil.prepare_kv(2, 1), {"long_hair": "100", "solo": "50"})
+
+    def test_prepare_kv_mapping_type(self):
+        class OrderedCSVUtilsTest(self.csvutil):
+            mapping_type = collections.OrderedDict
+
+        csvutil = OrderedCSVUtilsTest(["line1,line2"], ",")
+        self.assertIsInstance(csvutil.prepare_kv(1, 2), collections.OrderedDict)
+
     def test_is_ranged_or_raise(self):
         with self.assertRaises(ValueError):
             self.csvutil.is_ranged_or_raise(0, 1)
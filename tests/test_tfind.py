@@ -1,6 +1,17 @@
+import os
+import tempfile
 import unittest
+import unittest.mock
 
-from saniproclidemo.tfind import TFindEscaper
+from sanipro.delimiter import Delimiter
+
+from saniproclidemo.tfind import (
+    CsvUtils,
+    Formatter,
+    TagCount,
+    TFindEscaper,
+    TokenFinder,
+)
 
 
 class Testformat_a1111compat_token(unittest.TestCase):
@@ -10,3 +21,78 @@ class Testformat_a1111compat_token(unittest.TestCase):
         for input_text, expected in test_cases:
             with self.subTest(input_text=input_text):
                 self.assertEqual(TFindEscaper.escape_parentheses(input_text), expected)
+
+
+class TestTokenFinder(unittest.TestCase):
+    def test_execute(self):
+        for formatter in (Formatter.to_csv, None):
+            with self.subTest(formatter=formatter):
+                self._test_execute(TokenFinder(Delimiter(",", "\n", "\t"), formatter))
+
+    def _test_execute(self, finder: TokenFinder):
+        kvstore = TagCount({"1girl": "100", "solo": "50"})
+
+        test_cases = [
+            ("1girl, solo", "1girl\t100\nsolo\t50"),
+            ("1girl, unknown", "1girl\t100\nunknown\tNULL"),
+            ("1girl, , solo", "1girl\t100\nsolo\t50"),
+            ("", ""),
+        ]
+
+        for input_text, expected in test_cases:
+            with self.subTest(input_text=input_text):
+                self.assertEqual(finder.execute(input_text, kvstore), expected)
+
+
+class TestCsvUtils(unittest.TestCase):
+    def test_create_dict_from_io_cached(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, "tags.csv")
+            with open(csv_path, "w") as fp:
+                fp.write("long_hair,100\nsolo,50\n")
+            # older than the cache to be written, whatever the mtime resolution
+            os.utime(csv_path, (0, 0))
+
+            expected = {"long hair": "100", "solo": "50"}
+
+            with open(csv_path) as fp:
+                tag_count = CsvUtils.create_dict_from_io_cached(fp, ",", 1, 2)
+            self.assertEqual(tag_count, expected)
+
+            caches = [f for f in os.listdir(tmp_dir) if f.endswith(".pkl")]
+            self.assertEqual(len(caches), 1)
+
+            # the cache is used instead of parsing the csv file again
+            with open(csv_path) as fp, unittest.mock.patch.object(
+                CsvUtils, "create_dict_from_io", side_effect=AssertionError
+            ):
+                tag_count = CsvUtils.create_dict_from_io_cached(fp, ",", 1, 2)
+            self.assertIsInstance(tag_count, TagCount)
+            self.assertEqual(tag_count, expected)
+
+            # replaced with an older copy, the cache is not used anymore
+            with open(csv_path, "w") as fp:
+                fp.write("solo,10\n")
+            os.utime(csv_path, (0, 0))
+
+            with open(csv_path) as fp:
+                tag_count = CsvUtils.create_dict_from_io_cached(fp, ",", 1, 2)
+            self.assertEqual(tag_count, {"solo": "10"})
+
+    def test_create_dict_from_io_cached_version(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, "tags.csv")
+            with open(csv_path, "w") as fp:
+                fp.write("solo,50\n")
+
+            with open(csv_path) as fp:
+                CsvUtils.create_dict_from_io_cached(fp, ",", 1, 2)
+
+            # a cache from another version of the parser is not used
+            with open(csv_path) as fp, unittest.mock.patch(
+                "saniproclidemo.tfind.CACHE_VERSION", -1
+            ), unittest.mock.patch.object(
+                CsvUtils, "create_dict_from_io", return_value=TagCount()
+            ) as parse:
+                CsvUtils.create_dict_from_io_cached(fp, ",", 1, 2)
+            parse.assert_called_once()